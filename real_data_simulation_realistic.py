@@ -7,7 +7,6 @@ import os
 import requests
 import json
 from datetime import datetime
-import random
 from sklearn.preprocessing import MinMaxScaler
 from sklearn.cluster import KMeans
 
@@ -58,11 +57,43 @@ class RealCircuit:
     layout: List[Tuple[str, float, float]] = None  # (type, longueur, difficulté)
 
 class MotoGPRealDataSimulator:
-    def __init__(self):
-        """Initialise le simulateur avec des données réelles"""
+    # Clés de dérivation des flux aléatoires (voir _child_rng)
+    SESSION_STREAM = 0
+    RACE_STREAM = 2
+    BATCH_STREAM = 3
+    QUALIFYING_STREAM = 4
+    
+    # Format de qualification : les 10 premiers des essais vont directement en Q2,
+    # les 2 premiers de Q1 les rejoignent
+    Q2_DIRECT_ENTRIES = 10
+    Q1_ADVANCING = 2
+    QUALIFYING_TIMED_LAPS = 3  # Tours chronométrés par pilote et par séance
+    
+    # Taille des blocs de répliques de simulate_races_batch (un flux par bloc)
+    REPLICA_BLOCK = 1000
+    
+    # Points par position (indice = position, 0 = non classé)
+    POINTS_BY_POSITION = np.array([0, 25, 20, 16, 13, 11, 10, 9, 8, 7, 6, 5, 4, 3, 2, 1])
+    
+    def __init__(self, seed=None):
+        """Initialise le simulateur avec des données réelles
+        
+        `seed` (entier, SeedSequence, Generator ou None) fixe tous les tirages : un flux
+        pour les événements de séance, un flux pour les qualifications et un flux pour
+        les tirages de course, faits pour toute la grille à la fois.
+        """
         self.data_dir = "simulations/real_data"
         os.makedirs(self.data_dir, exist_ok=True)
         
+        if isinstance(seed, np.random.Generator):
+            seed = np.random.SeedSequence(seed.integers(2 ** 63, size=4))
+        elif not isinstance(seed, np.random.SeedSequence):
+            seed = np.random.SeedSequence(seed)
+        self.seed_sequence = seed
+        self.rng = self._child_rng(self.SESSION_STREAM)
+        self.race_rng = self._child_rng(self.RACE_STREAM)
+        self.qualifying_rng = self._child_rng(self.QUALIFYING_STREAM)
+        
         # Chargement ou création des données
         self.pilots = self._load_or_create_pilots()
         self.circuits = self._load_or_create_circuits()
@@ -73,6 +104,12 @@ class MotoGPRealDataSimulator:
         self.qualifying_influence = 0.25  # Influence de la position de départ
         self.random_factor = 0.05  # Facteur aléatoire (incidents, chance)
     
+    def _child_rng(self, *key: int) -> np.random.Generator:
+        """Générateur indépendant identifié par `key` sous la graine racine"""
+        root = self.seed_sequence
+        return np.random.default_rng(np.random.SeedSequence(root.entropy,
+                                                            spawn_key=root.spawn_key + key))
+    
     def _load_or_create_pilots(self) -> List[RealPilot]:
         """Charge ou crée les données des pilotes"""
         pilots_file = f"{self.data_dir}/pilots.json"
@@ -620,7 +657,7 @@ class MotoGPRealDataSimulator:
         
         # Simuler les qualifications
         qualifying_results = sorted(
-            [(p, p.qualifying_pace + random.uniform(-0.05, 0.05)) for p in self.pilots],
+            [(p, p.qualifying_pace + self.rng.uniform(-0.05, 0.05)) for p in self.pilots],
             key=lambda x: x[1],
             reverse=True
         )
@@ -632,7 +669,7 @@ class MotoGPRealDataSimulator:
         # Déterminer les abandons (DNF)
         for pilot, _ in qualifying_results:
             dnf_chance = pilot.raw_data.get("dnf_rate", 0.1)
-            if random.random() < dnf_chance:
+            if self.rng.random() < dnf_chance:
                 dnf_pilots.append(pilot.name)
         
         # Calculer les temps de course pour les pilotes qui terminent
@@ -645,7 +682,7 @@ class MotoGPRealDataSimulator:
                     "number": pilot.number,
                     "nationality": pilot.nationality,
                     "grid": position,
-                    "status": "Accident" if random.random() < 0.7 else "Technical",
+                    "status": "Accident" if self.rng.random() < 0.7 else "Technical",
                     "points": 0
                 })
                 continue
@@ -663,7 +700,7 @@ class MotoGPRealDataSimulator:
             )
             
             # Calculer le temps final
-            race_time = base_time * (2 - performance_factor) * (1 + random.uniform(-0.02, 0.02))
+            race_time = base_time * (2 - performance_factor) * (1 + self.rng.uniform(-0.02, 0.02))
             
             # Points selon la position
             points_map = {1: 25, 2: 20, 3: 16, 4: 13, 5: 11, 6: 10, 7: 9, 8: 8, 9: 7, 10: 6,
@@ -679,7 +716,7 @@ class MotoGPRealDataSimulator:
                 "time": race_time,
                 "gap": race_time - base_time if position > 1 else 0,
                 "points": points_map.get(position, 0),
-                "fastest_lap": position == 1 or random.random() < 0.1
+                "fastest_lap": position == 1 or self.rng.random() < 0.1
             })
         
         # Trier par position (DNF à la fin)
@@ -690,12 +727,27 @@ class MotoGPRealDataSimulator:
         
         return finished_results + dnf_results
     
-    def simulate_qualifying(self, circuit_name: str, weather_condition: str = "dry") -> pd.DataFrame:
-        """Simule une séance de qualification sur un circuit donné"""
-        # Trouver le circuit
+    def simulate_qualifying_batch(self, circuit_name: str, weather_condition: str = "dry",
+                                  n_replicas: int = 1, timed_laps: int = None,
+                                  rng: np.random.Generator = None) -> Dict:
+        """Qualifications au format Q1/Q2 pour `n_replicas` week-ends, en tableaux
+        
+        Trois séances (essais, Q1, Q2) où chaque pilote fait `timed_laps` tours
+        chronométrés ; son meilleur tour compte. Les Q2_DIRECT_ENTRIES premiers des
+        essais vont directement en Q2, les autres disputent Q1 dont les Q1_ADVANCING
+        premiers sont repêchés. La grille : Q2 dans l'ordre des temps de Q2, puis le
+        reste de Q1 dans l'ordre des temps de Q1. Les sélections utilisent un tri
+        partiel (argpartition), la grille un seul argsort.
+        
+        Retourne des tableaux répliques x pilotes (ordre de `self.pilots`) :
+        'grid_positions', 'best_times' (temps retenu pour la grille) et 'sessions'
+        (2 : Q2, 1 : éliminé en Q1).
+        """
         circuit = next((c for c in self.circuits if c.name == circuit_name), None)
         if not circuit:
             raise ValueError(f"Circuit {circuit_name} non trouvé")
+        rng = self.qualifying_rng if rng is None else rng
+        timed_laps = self.QUALIFYING_TIMED_LAPS if timed_laps is None else timed_laps
         
         # Facteurs météo
         weather_factor = 1.0
@@ -704,46 +756,97 @@ class MotoGPRealDataSimulator:
         elif weather_condition == "mixed":
             weather_factor = 0.95  # Conditions mixtes
         
-        # Simuler Q1
-        all_pilots = self.pilots.copy()
-        q1_results = []
-        
-        for pilot in all_pilots:
-            # Performance de base
-            base_performance = pilot.qualifying_pace
-            
-            # Ajustement météo
-            if weather_condition == "wet":
-                performance = base_performance * 0.7 + pilot.wet_performance * 0.3
-            else:
-                performance = base_performance
-            
-            # Variabilité
-            variability = random.uniform(-0.03, 0.03)
-            
-            # Temps au tour
-            lap_time = (100 - performance * 20) * (1 + variability) * weather_factor
-            
-            q1_results.append({
-                "name": pilot.name,
-                "team": pilot.team,
-                "number": pilot.number,
-                "nationality": pilot.nationality,
-                "lap_time": lap_time
-            })
-        
-        # Trier par temps au tour
-        q1_results.sort(key=lambda x: x["lap_time"])
-        
-        # Ajouter les positions
-        for i, result in enumerate(q1_results):
-            result["position"] = i + 1
-        
-        # Convertir en DataFrame
-        qualifying_df = pd.DataFrame(q1_results)
+        # Performance de base (ajustée à la météo)
+        performance = np.array([p.qualifying_pace for p in self.pilots])
+        if weather_condition == "wet":
+            performance = performance * 0.7 + np.array([p.wet_performance for p in self.pilots]) * 0.3
+        base_lap_time = (100 - performance * 20) * weather_factor
+        
+        n_pilots = len(self.pilots)
+        shape = (n_replicas, n_pilots)
+        rows = np.arange(n_replicas)[:, None]
+        
+        def session_best():
+            # Meilleur des `timed_laps` tours de chaque pilote
+            variability = rng.uniform(-0.03, 0.03, (timed_laps,) + shape)
+            return (base_lap_time * (1 + variability)).min(axis=0)
+        
+        # Essais : accès direct en Q2
+        n_direct = min(self.Q2_DIRECT_ENTRIES, n_pilots)
+        in_q2 = np.zeros(shape, dtype=bool)
+        if n_direct:
+            practice = session_best()
+            in_q2[rows, np.argpartition(practice, n_direct - 1, axis=1)[:, :n_direct]] = True
+        
+        # Q1 : pilotes non qualifiés directement, les meilleurs sont repêchés
+        q1_times = np.where(in_q2, np.inf, session_best())
+        n_advancing = min(self.Q1_ADVANCING, n_pilots - n_direct)
+        if n_advancing:
+            advancing = np.argpartition(q1_times, n_advancing - 1, axis=1)[:, :n_advancing]
+            in_q2[rows, advancing] = True
+        
+        # Q2, puis grille : Q2 devant Q1, chacun dans l'ordre de ses temps
+        q2_times = session_best()
+        best_times = np.where(in_q2, q2_times, q1_times)
+        grid_key = np.where(in_q2, 0.0, best_times.max() + 1.0) + best_times
+        order = np.argsort(grid_key, axis=1)
+        grid_positions = np.empty(shape, dtype=np.int16)
+        grid_positions[rows, order] = np.arange(1, n_pilots + 1)
         
-        return qualifying_df
+        return {
+            "grid_positions": grid_positions,
+            "best_times": best_times,
+            "sessions": np.where(in_q2, 2, 1).astype(np.int8)
+        }
+    
+    def simulate_qualifying(self, circuit_name: str, weather_condition: str = "dry") -> pd.DataFrame:
+        """Simule les qualifications (Q1/Q2) sur un circuit donné
+        
+        Une réplique de simulate_qualifying_batch, mise sous forme de DataFrame trié
+        par position.
+        """
+        qualifying = self.simulate_qualifying_batch(circuit_name, weather_condition)
+        
+        qualifying_df = pd.DataFrame({
+            "name": [p.name for p in self.pilots],
+            "team": [p.team for p in self.pilots],
+            "number": [p.number for p in self.pilots],
+            "nationality": [p.nationality for p in self.pilots],
+            "lap_time": qualifying["best_times"][0],
+            "session": np.where(qualifying["sessions"][0] == 2, "Q2", "Q1"),
+            "position": qualifying["grid_positions"][0].astype(int)
+        })
+        
+        return qualifying_df.sort_values("position").reset_index(drop=True)
 
+    def sample_dnf_schedule(self, race_laps: int, n_replicas: int = 1,
+                            pilots: List[RealPilot] = None,
+                            rng: np.random.Generator = None) -> Dict:
+        """Tire les abandons de tous les pilotes et de toutes les répliques en une fois
+        
+        Chaque pilote abandonne avec la probabilité `dnf_rate` de ses données brutes
+        (0.2 par défaut), à un tour tiré dans la distribution en U habituelle (plus
+        probable en début ou fin de course). Retourne, pour `pilots` (par défaut
+        `self.pilots`) :
+        - 'retires' : tirage de Bernoulli (répliques x pilotes) ;
+        - 'dnf_laps' : tour d'abandon (répliques x pilotes, 0 : pas d'abandon) ;
+        - 'running' : masque répliques x tours x pilotes, vrai si le pilote prend le
+          départ du tour (le tour d'abandon compris).
+        """
+        pilots = self.pilots if pilots is None else pilots
+        rng = self.race_rng if rng is None else rng
+        shape = (n_replicas, len(pilots))
+        
+        dnf_rate = np.array([p.raw_data.get("dnf_rate", 0.2) for p in pilots])
+        lap_distribution = np.array([1] * 3 + list(range(2, race_laps - 1)) + [race_laps - 1] * 2)
+        
+        retires = rng.random(shape) < dnf_rate
+        dnf_laps = np.where(retires, rng.choice(lap_distribution, shape), 0).astype(np.int16)
+        laps = np.arange(1, race_laps + 1)[None, :, None]
+        running = ~retires[:, None, :] | (dnf_laps[:, None, :] >= laps)
+        
+        return {"retires": retires, "dnf_laps": dnf_laps, "running": running}
+    
     def simulate_race(self, circuit_name: str, qualifying_results: pd.DataFrame, 
                      weather_condition: str = "dry", race_laps: int = 20) -> pd.DataFrame:
         """Simule une course complète basée sur les résultats des qualifications"""
@@ -759,173 +862,300 @@ class MotoGPRealDataSimulator:
         elif weather_condition == "mixed":
             weather_factor = 0.95  # Conditions mixtes
         
-        # Préparer les données de course
-        race_data = []
-        
         # Grille de départ basée sur les qualifications
         grid = qualifying_results.sort_values("position").copy()
-        
-        # Déterminer les abandons (DNF)
-        dnf_pilots = []
-        dnf_laps = {}
-        
-        for _, row in grid.iterrows():
-            pilot = next((p for p in self.pilots if p.name == row["name"]), None)
-            if pilot:
-                # Augmenter le taux d'abandon pour plus de réalisme
-                dnf_chance = pilot.raw_data.get("dnf_rate", 0.2)
-                if random.random() < dnf_chance:
-                    dnf_pilots.append(pilot.name)
-                    # Déterminer le tour d'abandon (plus probable en début ou fin de course)
-                    lap_distribution = [1] * 3 + [i for i in range(2, race_laps-1)] + [race_laps-1] * 2
-                    dnf_laps[pilot.name] = random.choice(lap_distribution)
-        
-        # Simuler chaque tour
-        positions = {row["name"]: idx + 1 for idx, row in grid.iterrows()}
-        cumulative_times = {row["name"]: 0 for _, row in grid.iterrows()}
-        
+        pilots_by_name = {p.name: p for p in self.pilots}
+        grid_pilots = [pilots_by_name[name] for name in grid["name"] if name in pilots_by_name]
+        
+        # Déterminer les abandons (DNF) de toute la grille
+        dnf_schedule = self.sample_dnf_schedule(race_laps, pilots=grid_pilots)
+        running_mask = dnf_schedule["running"][0]
+        dnf_laps = dnf_schedule["dnf_laps"][0]
+        
+        # État de course en tableaux, dans l'ordre de la grille
+        n_pilots = len(grid_pilots)
+        names = np.array([p.name for p in grid_pilots], dtype=object)
+        teams = np.array([p.team for p in grid_pilots], dtype=object)
+        race_pace = np.array([p.race_pace for p in grid_pilots])
+        wet_performance = np.array([p.wet_performance for p in grid_pilots])
+        consistency = np.array([p.consistency for p in grid_pilots])
+        
+        # Performance de base (ajustée à la météo)
+        if weather_condition == "wet":
+            performance = race_pace * 0.7 + wet_performance * 0.3
+        else:
+            performance = race_pace
+        base_lap_time = (100 - performance * 20) * weather_factor
+        incident_chance = 0.05 * (1 - consistency)
+        running_status = np.full(n_pilots, "Running", dtype=object)
+        
+        positions = np.arange(1, n_pilots + 1)
+        cumulative_times = np.zeros(n_pilots)
+        dnf_causes = np.array(["Accident", "Chute", "Problème technique", "Problème moteur", 
+                               "Pneus", "Électronique", "Collision"], dtype=object)
+        
+        # Tirages de toute la course en une fois (tours x pilotes) : variabilité,
+        # incidents aléatoires (erreurs, dépassements ratés, etc.) et leur coût
+        rng = self.race_rng
+        base_variability = rng.uniform(-0.04, 0.04, (race_laps, n_pilots))
+        incidents = rng.random((race_laps, n_pilots)) < incident_chance
+        incident_cost = np.where(incidents, rng.uniform(0.02, 0.08, (race_laps, n_pilots)), 0.0)
+        columns = {key: [] for key in ("lap", "index", "position", "lap_time",
+                                       "cumulative_time", "status")}
+        
+        def record(lap, index, position, lap_time, status):
+            columns["lap"].append(np.full(index.size, lap))
+            columns["index"].append(index)
+            columns["position"].append(position)
+            columns["lap_time"].append(lap_time)
+            columns["cumulative_time"].append(cumulative_times[index])
+            columns["status"].append(status)
+        
+        # Simuler chaque tour : temps de toute la grille en une passe
         for lap in range(1, race_laps + 1):
-            # Calculer les temps au tour pour chaque pilote
-            lap_times = {}
+            running = np.flatnonzero(running_mask[lap - 1])
+            consistency_running = consistency[running]
             
-            for _, row in grid.iterrows():
-                pilot_name = row["name"]
-                
-                # Vérifier si le pilote a abandonné avant ce tour
-                if pilot_name in dnf_pilots and dnf_laps[pilot_name] < lap:
-                    continue
-                
-                pilot = next((p for p in self.pilots if p.name == pilot_name), None)
-                if not pilot:
-                    continue
-                
-                # Position actuelle
-                current_position = positions[pilot_name]
-                
-                # Performance de base
-                base_performance = pilot.race_pace
-                
-                # Ajustements
-                if weather_condition == "wet":
-                    performance = base_performance * 0.7 + pilot.wet_performance * 0.3
-                else:
-                    performance = base_performance
-                
-                # Facteur de position (plus difficile de remonter depuis l'arrière)
-                position_factor = 1 - (current_position - 1) * 0.005
-                
-                # Usure des pneus
-                tire_wear = lap / race_laps * 0.1
-                tire_factor = 1 - tire_wear * (1 - pilot.consistency * 0.5)
-                
-                # Facteur de fatigue du pilote (augmente la variabilité en fin de course)
-                fatigue_factor = 1 + (lap / race_laps) * 0.05 * (1 - pilot.consistency)
-                
-                # Variabilité (plus grande pour créer des écarts plus réalistes)
-                variability = random.uniform(-0.04, 0.04) * fatigue_factor
-                
-                # Incidents aléatoires (erreurs, dépassements ratés, etc.)
-                incident_chance = 0.05 * (1 - pilot.consistency)
-                if random.random() < incident_chance:
-                    # Petite erreur qui coûte du temps
-                    variability += random.uniform(0.02, 0.08)
-                
-                # Temps au tour
-                lap_time = (100 - performance * 20) * position_factor * tire_factor * (1 + variability) * weather_factor
-                
-                # Enregistrer le temps au tour
-                lap_times[pilot_name] = lap_time
-                cumulative_times[pilot_name] += lap_time
-                
-                # Ajouter aux données de course
-                race_data.append({
-                    "lap": lap,
-                    "name": pilot_name,
-                    "team": pilot.team,
-                    "position": current_position,
-                    "lap_time": lap_time,
-                    "cumulative_time": cumulative_times[pilot_name],
-                    "status": "Running"
-                })
+            # Facteur de position (plus difficile de remonter depuis l'arrière)
+            position_factor = 1 - (positions[running] - 1) * 0.005
+            
+            # Usure des pneus
+            tire_wear = lap / race_laps * 0.1
+            tire_factor = 1 - tire_wear * (1 - consistency_running * 0.5)
+            
+            # Facteur de fatigue du pilote (augmente la variabilité en fin de course)
+            fatigue_factor = 1 + (lap / race_laps) * 0.05 * (1 - consistency_running)
+            
+            # Variabilité (plus grande pour créer des écarts plus réalistes) et incidents
+            variability = (base_variability[lap - 1, running] * fatigue_factor
+                           + incident_cost[lap - 1, running])
+            
+            # Temps au tour
+            lap_times = base_lap_time[running] * position_factor * tire_factor * (1 + variability)
+            cumulative_times[running] += lap_times
+            record(lap, running, positions[running].astype(float), lap_times,
+                   running_status[:running.size])
             
             # Mettre à jour les positions pour le prochain tour (sauf au dernier tour)
             if lap < race_laps:
-                # Trier les pilotes par temps cumulé
-                active_pilots = [p for p in positions.keys() if p not in dnf_pilots or dnf_laps[p] >= lap]
-                active_pilots.sort(key=lambda p: cumulative_times.get(p, float('inf')))
-                
-                # Mettre à jour les positions
-                for pos, pilot_name in enumerate(active_pilots, 1):
-                    positions[pilot_name] = pos
+                order = running[np.argsort(cumulative_times[running], kind="stable")]
+                positions[order] = np.arange(1, order.size + 1)
             
             # Ajouter les DNF pour ce tour
-            for pilot_name in dnf_pilots:
-                if dnf_laps[pilot_name] == lap:
-                    pilot = next((p for p in self.pilots if p.name == pilot_name), None)
-                    if pilot:
-                        # Déterminer la cause de l'abandon
-                        dnf_causes = ["Accident", "Chute", "Problème technique", "Problème moteur", 
-                                     "Pneus", "Électronique", "Collision"]
-                        dnf_cause = random.choice(dnf_causes)
-                        
-                        race_data.append({
-                            "lap": lap,
-                            "name": pilot_name,
-                            "team": pilot.team,
-                            "position": None,
-                            "lap_time": None,
-                            "cumulative_time": cumulative_times.get(pilot_name, 0),
-                            "status": f"DNF - {dnf_cause}"
-                        })
+            retiring = np.flatnonzero(dnf_laps == lap)
+            if retiring.size:
+                causes = rng.choice(dnf_causes, retiring.size)
+                record(lap, retiring, np.full(retiring.size, np.nan),
+                       np.full(retiring.size, np.nan), "DNF - " + causes)
         
         # Convertir en DataFrame
-        race_df = pd.DataFrame(race_data)
+        index = np.concatenate(columns["index"])
+        race_df = pd.DataFrame({
+            "lap": np.concatenate(columns["lap"]),
+            "name": names[index],
+            "team": teams[index],
+            "position": np.concatenate(columns["position"]),
+            "lap_time": np.concatenate(columns["lap_time"]),
+            "cumulative_time": np.concatenate(columns["cumulative_time"]),
+            "status": np.concatenate(columns["status"])
+        })
         
         return race_df
     
-    def analyze_race_results(self, race_df: pd.DataFrame, qualifying_df: pd.DataFrame) -> Dict:
-        """Analyse les résultats d'une course"""
-        # Extraire le dernier tour pour chaque pilote
-        final_lap = race_df.groupby("name")["lap"].max().reset_index()
-        final_results = []
+    def simulate_races_batch(self, circuit_name: str, weather_condition: str = "dry",
+                             n_replicas: int = 1000, race_laps: int = 20,
+                             first_replica: int = 0) -> Dict:
+        """Simule qualification et course pour `n_replicas` répliques indépendantes
+        
+        Mêmes modèles que simulate_qualifying et simulate_race, calculés sur des
+        tableaux répliques x pilotes, tour par tour, par blocs de REPLICA_BLOCK
+        répliques. Les répliques sont numérotées à partir de `first_replica` (un
+        multiple de REPLICA_BLOCK) ; chaque bloc tire dans son propre flux, dérivé de la
+        graine racine et de son numéro, et est toujours simulé en entier. Une réplique
+        ne dépend donc que de la graine et de son indice : découper les répliques
+        entre processus donne exactement les mêmes courses. Rien n'est affiché ni
+        écrit sur disque.
+        
+        Les modèles de temps sont ceux de simulate_qualifying et simulate_race, mais
+        le classement n'est pas celui de simulate_race + analyze_race_results : ici,
+        les pilotes à l'arrivée sont classés au temps cumulé final et les abandons ne
+        marquent aucun point (140 points par course). analyze_race_results reprend la
+        position au début du dernier tour et compte la ligne "Running" des pilotes qui
+        abandonnent au dernier tour (environ 158 points par course, 300 courses
+        mesurées). Les probabilités de victoire peuvent différer de quelques points :
+        ne pas comparer directement les deux chaînes.
+        
+        Retourne des tableaux compacts (répliques x pilotes, pilotes dans l'ordre de
+        `self.pilots`, repris dans 'names') :
+        - 'qualifying_positions' : position sur la grille ;
+        - 'final_positions' : classement à l'arrivée au temps cumulé (0 : abandon) ;
+        - 'points' : points du classement à l'arrivée ;
+        - 'dnf_laps' : tour d'abandon (0 : à l'arrivée) ;
+        - 'best_laps' : meilleur tour de chaque pilote ;
+        et les distributions résumées : 'summary' (une ligne par pilote, triée par
+        probabilité de victoire) et 'position_distribution' (pilotes x positions).
+        """
+        circuit = next((c for c in self.circuits if c.name == circuit_name), None)
+        if not circuit:
+            raise ValueError(f"Circuit {circuit_name} non trouvé")
+        if first_replica % self.REPLICA_BLOCK:
+            raise ValueError(f"first_replica doit être un multiple de {self.REPLICA_BLOCK}")
+        
+        # Facteurs météo
+        weather_factor = 1.0
+        if weather_condition == "wet":
+            weather_factor = 0.9  # Piste mouillée = plus lent
+        elif weather_condition == "mixed":
+            weather_factor = 0.95  # Conditions mixtes
         
-        for _, row in final_lap.iterrows():
-            pilot_name = row["name"]
-            max_lap = row["lap"]
+        n_pilots = len(self.pilots)
+        block = self.REPLICA_BLOCK
+        race_pace = np.array([p.race_pace for p in self.pilots])
+        wet_performance = np.array([p.wet_performance for p in self.pilots])
+        consistency = np.array([p.consistency for p in self.pilots])
+        if weather_condition == "wet":
+            race_pace = race_pace * 0.7 + wet_performance * 0.3
+        
+        incident_chance = 0.05 * (1 - consistency)
+        
+        results = {
+            "qualifying_positions": np.empty((n_replicas, n_pilots), dtype=np.int16),
+            "final_positions": np.empty((n_replicas, n_pilots), dtype=np.int16),
+            "points": np.empty((n_replicas, n_pilots), dtype=np.int16),
+            "dnf_laps": np.empty((n_replicas, n_pilots), dtype=np.int16),
+            "best_laps": np.empty((n_replicas, n_pilots), dtype=np.float32),
+        }
+        
+        for start in range(0, n_replicas, block):
+            stop = min(start + block, n_replicas)
+            kept = slice(0, stop - start)  # Le dernier bloc est simulé en entier puis tronqué
+            shape = (block, n_pilots)
+            rng = self._child_rng(self.BATCH_STREAM, (first_replica + start) // block)
+            
+            # Qualification (Q1/Q2)
+            positions = self.simulate_qualifying_batch(circuit_name, weather_condition,
+                                                       block, rng=rng)["grid_positions"]
+            results["qualifying_positions"][start:stop] = positions[kept]
             
-            # Données du dernier tour du pilote
-            last_lap_data = race_df[(race_df["name"] == pilot_name) & (race_df["lap"] == max_lap)].iloc[0]
+            # Abandons
+            dnf_schedule = self.sample_dnf_schedule(race_laps, block, rng=rng)
             
-            # Position de qualification
-            quali_position = qualifying_df[qualifying_df["name"] == pilot_name]["position"].values[0]
+            # Course tour par tour
+            cumulative_times = np.zeros(shape)
+            best_laps = np.full(shape, np.inf)
+            for lap in range(1, race_laps + 1):
+                running = dnf_schedule["running"][:, lap - 1]
+                position_factor = 1 - (positions - 1) * 0.005
+                tire_factor = 1 - lap / race_laps * 0.1 * (1 - consistency * 0.5)
+                fatigue_factor = 1 + (lap / race_laps) * 0.05 * (1 - consistency)
+                variability = rng.uniform(-0.04, 0.04, shape) * fatigue_factor
+                variability += np.where(rng.random(shape) < incident_chance,
+                                        rng.uniform(0.02, 0.08, shape), 0.0)
+                lap_times = ((100 - race_pace * 20) * position_factor * tire_factor
+                             * (1 + variability) * weather_factor)
+                cumulative_times += np.where(running, lap_times, 0.0)
+                best_laps = np.where(running, np.minimum(best_laps, lap_times), best_laps)
+                
+                # Positions pour le tour suivant (les pilotes arrêtés passent derrière)
+                if lap < race_laps:
+                    positions = self._rank(np.where(running, cumulative_times, np.inf))
             
-            # Statut final
-            status = last_lap_data["status"]
+            # Classement à l'arrivée
+            finished = ~dnf_schedule["retires"]
+            final_positions = np.where(finished,
+                                       self._rank(np.where(finished, cumulative_times, np.inf)), 0)
+            points_index = np.minimum(final_positions, len(self.POINTS_BY_POSITION) - 1)
+            points = np.where(final_positions < len(self.POINTS_BY_POSITION),
+                              self.POINTS_BY_POSITION[points_index], 0)
+            results["final_positions"][start:stop] = final_positions[kept]
+            results["points"][start:stop] = points[kept]
+            results["dnf_laps"][start:stop] = dnf_schedule["dnf_laps"][kept]
+            results["best_laps"][start:stop] = best_laps[kept]
+        
+        results["names"] = np.array([p.name for p in self.pilots])
+        results.update(self._summarize_race_batch(results))
+        return results
+    
+    @staticmethod
+    def _rank(times: np.ndarray) -> np.ndarray:
+        """Rang (1 = plus petit) de chaque pilote, ligne par ligne (égalités : ordre des pilotes)"""
+        order = np.argsort(times, axis=1, kind="stable")
+        ranks = np.empty_like(order)
+        np.put_along_axis(ranks, order, np.arange(1, times.shape[1] + 1)[None, :], axis=1)
+        return ranks
+    
+    def _summarize_race_batch(self, results: Dict) -> Dict:
+        """Distributions résumées d'un lot de répliques (simulate_races_batch)"""
+        final_positions = results["final_positions"]
+        n_pilots = final_positions.shape[1]
+        finished = final_positions > 0
+        with np.errstate(invalid="ignore"):
+            mean_position = (np.where(finished, final_positions, 0).sum(axis=0)
+                             / finished.sum(axis=0))
+        
+        summary = pd.DataFrame({
+            "name": results["names"],
+            "team": [p.team for p in self.pilots],
+            "win_probability": (final_positions == 1).mean(axis=0),
+            "podium_probability": (finished & (final_positions <= 3)).mean(axis=0),
+            "pole_probability": (results["qualifying_positions"] == 1).mean(axis=0),
+            "dnf_probability": (~finished).mean(axis=0),
+            "mean_points": results["points"].mean(axis=0),
+            "std_points": results["points"].std(axis=0),
+            "mean_position": mean_position,
+            "mean_best_lap": results["best_laps"].mean(axis=0, dtype=np.float64),
+        }).sort_values("win_probability", ascending=False).reset_index(drop=True)
+        
+        # Probabilité de chaque position finale (colonne 0 : abandon)
+        counts = np.stack([(final_positions == position).sum(axis=0)
+                           for position in range(n_pilots + 1)], axis=1)
+        position_distribution = pd.DataFrame(counts / len(final_positions),
+                                             index=results["names"],
+                                             columns=range(n_pilots + 1))
+        
+        return {"summary": summary, "position_distribution": position_distribution}
+    
+    def analyze_race_results(self, race_df: pd.DataFrame, qualifying_df: pd.DataFrame) -> Dict:
+        """Analyse les résultats d'une course"""
+        # Dernier tour de chaque pilote : première ligne de son tour maximal
+        max_lap = race_df.groupby("name")["lap"].transform("max")
+        last_laps = (race_df[race_df["lap"] == max_lap]
+                     .drop_duplicates("name")
+                     .sort_values("name"))
+        
+        # Position de qualification
+        quali_positions = qualifying_df.drop_duplicates("name")[["name", "position"]]
+        last_laps = last_laps.merge(quali_positions.rename(columns={"position": "qualifying_position"}),
+                                    on="name", how="left")
+        
+        # Temps cumulé du leader à chaque tour
+        leaders = race_df[race_df["position"] == 1].drop_duplicates("lap")
+        leader_times = leaders.set_index("lap")["cumulative_time"]
+        last_laps["leader_time"] = last_laps["lap"].map(leader_times)
+        
+        final_results = []
+        for row in last_laps.itertuples(index=False):
+            position = row.position
+            status = row.status
             
             # Points selon la position
-            points_map = {1: 25, 2: 20, 3: 16, 4: 13, 5: 11, 6: 10, 7: 9, 8: 8, 9: 7, 10: 6,
-                         11: 5, 12: 4, 13: 3, 14: 2, 15: 1}
-            
-            position = last_lap_data["position"]
-            points = points_map.get(position, 0) if position and status == "Running" else 0
+            points = 0
+            if status == "Running" and 1 <= position < len(self.POINTS_BY_POSITION):
+                points = self.POINTS_BY_POSITION[int(position)]
             
             # Calculer l'écart avec le leader pour les pilotes qui terminent
             gap_to_leader = None
-            if status == "Running" and position > 1:
-                # Trouver le temps du leader au dernier tour
-                leader_data = race_df[(race_df["lap"] == max_lap) & (race_df["position"] == 1)]
-                if not leader_data.empty:
-                    leader_time = leader_data.iloc[0]["cumulative_time"]
-                    gap_to_leader = last_lap_data["cumulative_time"] - leader_time
+            if status == "Running" and position > 1 and not pd.isna(row.leader_time):
+                gap_to_leader = row.cumulative_time - row.leader_time
             
             final_results.append({
-                "name": pilot_name,
-                "team": last_lap_data["team"],
+                "name": row.name,
+                "team": row.team,
                 "final_position": int(position) if position and not pd.isna(position) else None,
-                "qualifying_position": int(quali_position) if not pd.isna(quali_position) else None,
+                "qualifying_position": int(row.qualifying_position) if not pd.isna(row.qualifying_position) else None,
                 "status": status,
-                "points": int(points) if not pd.isna(points) else 0,
-                "laps_completed": int(max_lap) if not pd.isna(max_lap) else 0,
+                "points": int(points),
+                "laps_completed": int(row.lap) if not pd.isna(row.lap) else 0,
                 "gap_to_leader": float(gap_to_leader) if gap_to_leader is not None else None
             })
         
@@ -0,0 +1,71 @@
+import numpy as np
+import pytest
+
+from simulation import MotoGPSimulator, SegmentTimeTable, verify_kernel_backends
+
+
+def test_segment_table_refuses_qss_engine():
+    simulator = MotoGPSimulator(lap_engine="qss", seed=0)
+    with pytest.raises(ValueError):
+        SegmentTimeTable.build(simulator, n_speeds=11, n_degradation=3, workers=1)
+
+
+def test_segment_table_fingerprint_includes_setup():
+    table = SegmentTimeTable.build(MotoGPSimulator(seed=0), n_speeds=11, n_degradation=3,
+                                   workers=1, validation_laps=3)
+    assert table.max_error["lap_time_abs"] > 0
+
+    simulator = MotoGPSimulator(lap_engine="qss", seed=0)
+    assert not table.matches(simulator)
+    with pytest.raises(ValueError):
+        simulator.use_segment_table(table)
+
+    simulator = MotoGPSimulator(seed=0)
+    simulator.distance_steps = 2
+    assert not table.matches(simulator)
+
+
+@pytest.mark.parametrize("seed", range(4))
+def test_segment_memo_lap_error_bound(seed):
+    exact = MotoGPSimulator(seed=seed).simulate_race_arrays(25, False)["lap_times"]
+    simulator = MotoGPSimulator(seed=seed)
+    simulator.enable_segment_memo()
+    memoized = simulator.simulate_race_arrays(25, False)["lap_times"]
+    assert np.abs(memoized - exact).max() < 0.045
+
+
+def test_race_base_times_follow_solver_settings():
+    simulator = MotoGPSimulator("distance", seed=0)
+    coarse = simulator.race_base_times(3)
+    simulator.distance_steps = 32
+    assert not np.array_equal(simulator.race_base_times(3), coarse)
+
+    simulator = MotoGPSimulator("euler", seed=0)
+    unbounded = simulator.race_base_times(3)
+    simulator.time_limit = 1.0
+    assert not np.array_equal(simulator.race_base_times(3), unbounded)
+
+
+def test_scalar_path_honours_qss_engine():
+    simulator = MotoGPSimulator(lap_engine="qss", seed=0)
+    with pytest.raises(ValueError):
+        simulator.simulate_lap(simulator.pilots[0], 1)
+
+    scalar = simulator.simulate_race_arrays(2, False)["lap_times"]
+    simulator.reseed(0)
+    batched = simulator.simulate_race_arrays(2, False, batched=True)["lap_times"]
+    np.testing.assert_array_equal(scalar, batched)
+
+
+def test_numba_kernels_match_numpy():
+    pytest.importorskip("numba")
+    assert verify_kernel_backends()["numba"] == 0.0
+
+
+def test_segment_memo_follows_solver_settings():
+    simulator = MotoGPSimulator("distance", seed=0)
+    simulator.enable_segment_memo()
+    coarse = simulator.simulate_race_arrays(3, False)["lap_times"]
+    simulator.reseed(0)
+    simulator.distance_steps = 2
+    assert not np.array_equal(simulator.simulate_race_arrays(3, False)["lap_times"], coarse)